@@ -1,4 +1,5 @@
 import os
+import io
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import ctypes
@@ -7,20 +8,48 @@ import threading
 import platform
 import hashlib
 import json
+import struct
+import mmap
 import time
 import pygame
-import librosa
-import librosa.display
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from mutagen import File as MutagenFile
 from datetime import datetime
 from PIL import Image, ImageTk
-import io
-from scipy.stats import kurtosis, skew
 import soundfile as sf
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# librosa、matplotlib、numba、scipy 导入耗时较长，改为首次使用时导入，
+# 窗口显示后再由后台线程预先加载
+
+def import_librosa():
+    import librosa
+    import scipy.fft
+    # librosa 默认使用单线程的 numpy.fft，改用 scipy.fft 以便按帧多线程计算
+    librosa.set_fftlib(scipy.fft)
+    return librosa
+
+_magma = None
+
+def import_colormap():
+    """延迟导入matplotlib并取频谱图色表，后端只在首次调用时设置一次"""
+    global _magma
+    if _magma is None:
+        import matplotlib
+        # 只查色表不绘图：固定为Agg，避免后续任何pyplot导入去初始化TkAgg
+        matplotlib.use('Agg')
+        _magma = matplotlib.colormaps['magma']
+    return _magma
+
+def preload_modules():
+    """后台预先导入重量级模块，用户选择文件期间完成加载"""
+    try:
+        import_librosa()
+        import_colormap()
+        import yydb_kernels
+        yydb_kernels.warmup()
+    except:
+        pass
 
 def get_system_theme():
     try:
@@ -36,24 +65,384 @@ def get_system_theme():
     except:
         return 'light'
 
-def hash_file(path):
-    h = hashlib.md5()
-    with open(path, 'rb') as f:
-        while chunk := f.read(8192):
-            h.update(chunk)
-    return h.hexdigest()
+def load_audio(path, data=None, max_duration=None):
+    """优先用 soundfile 直接解码为 float32 单声道，libsndfile 不支持的格式回退到 librosa.load。
+    data 为已映射到内存的文件内容时直接从中解码，不再重新读盘；
+    给定 max_duration 时只解码开头这么多秒。返回 (y, sr, 整个文件的采样点数)"""
+    try:
+        if data is not None:
+            data.seek(0)
+        with sf.SoundFile(path if data is None else data) as f:
+            sr = f.samplerate
+            n_total = f.frames
+            frames = -1 if max_duration is None else int(max_duration * sr)
+            y = f.read(frames=frames, dtype='float32', always_2d=False)
+    except RuntimeError:
+        librosa = import_librosa()
+        y, sr = librosa.load(path, sr=None, mono=True, dtype=np.float32)
+        n_total = len(y)
+        if max_duration is not None:
+            y = y[:int(max_duration * sr)].copy()  # 复制片段，释放整段音频
+    if y.ndim > 1:
+        y = y.mean(axis=1, dtype=np.float32)
+    # 统一为连续float32：归约只需一半内存带宽，Numba核函数也只需编译一种类型
+    return np.ascontiguousarray(y, dtype=np.float32), sr, n_total
+
+def iter_audio_blocks(path, blocksize):
+    """按块流式读取 float32 单声道音频，内存中只保留一个块；
+    libsndfile 不支持的格式回退为整段解码后切块"""
+    try:
+        f = sf.SoundFile(path)
+    except RuntimeError:
+        y, _, _ = load_audio(path)
+        for i in range(0, len(y), blocksize):
+            yield y[i:i + blocksize]
+        return
+    with f:
+        for block in f.blocks(blocksize=blocksize, dtype='float32', always_2d=True):
+            yield block.mean(axis=1, dtype=np.float32)
+
+# 文件哈希缓存，键为 (路径, 修改时间, 大小)，避免同一文件重复读盘
+_hash_cache = {}
+
+def _new_hasher():
+    # 哈希只用作缓存键与文件指纹，无需密码学强度；blake2b 在x86-64上比MD5和SHA-256都快
+    return hashlib.blake2b(digest_size=16)
+
+def hash_file(path, data=None):
+    """文件指纹；data 为调用方已建立的内存映射时直接复用"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _hash_cache.get(key)
+    if digest is None:
+        h = _new_hasher()
+        if data is not None:
+            h.update(data)
+        elif st.st_size:
+            # 内存映射后整体交给hashlib：零拷贝，由系统按页读入，计算期间释放GIL
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        digest = h.hexdigest()
+        _hash_cache[key] = digest
+    return digest
+
+SUPPORTED_EXTS = ('.mp3', '.flac', '.wav', '.m4a', '.ape', '.dsf',
+                  '.dsd', '.dff', '.aac', '.ogg', '.opus', '.wma',
+                  '.aiff', '.aif', '.au', '.raw', '.pcm', '.caf',
+                  '.tta', '.wv')
+
+# 频谱图像素尺寸（宽, 高），显示时再按控件宽度缩放
+SPEC_SIZE = (640, 480)
+
+# 基频估计使用的采样率
+ANALYSIS_SR = 22050
+
+# 评分项与阈值，界面显示与导出报告共用
+SCORE_KEYS = ("比特率", "动态范围", "编码质量", "响度与动态", "结构完整性")
+BITRATE_THR = 256       # kbps
+DYNAMIC_RANGE_THR = 12  # dB
+LOUDNESS_THR = -18      # dB
+BANDWIDTH_THR = 1000    # Hz
+
+def score_features(features):
+    """按 SCORE_KEYS 顺序返回各项得分（20或10）；特征值可为数组，便于批量评分"""
+    bitrate_ok = np.asarray(features["bitrate"]) > BITRATE_THR
+    dynamic_ok = np.asarray(features["dynamic_range"]) > DYNAMIC_RANGE_THR
+    passed = np.stack([
+        bitrate_ok,
+        dynamic_ok,
+        bitrate_ok,  # 编码质量基于比特率评分
+        (np.asarray(features["loudness_db"]) > LOUDNESS_THR) & dynamic_ok,
+        np.asarray(features["spec_bw"]) > BANDWIDTH_THR
+    ])
+    return np.where(passed, 20, 10)
+
+# 分析缓存目录：<哈希>.json 保存采样率、时长和特征，<哈希>.png 保存渲染好的频谱图
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yydb")
+CACHE_LIMIT = 500 * 1024 * 1024  # 缓存目录上限，超出后淘汰最久未使用的文件
+
+# Numba的cache=True缓存默认写在源码旁的__pycache__，程序目录不可写时会失效；
+# 改存到用户缓存目录（须在导入numba之前设置）。打包的exe没有源文件，不使用磁盘缓存（见yydb_kernels）
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.join(CACHE_DIR, "numba"))
+
+# 缓存格式/特征算法版本：任何会改变特征数值的修改都要递增，旧缓存随之失效
+CACHE_VERSION = 2
+FEATURE_KEYS = frozenset(("loudness_db", "dynamic_range", "silent_ratio", "spec_centroid", "spec_bw",
+                          "tempo", "zero_crossings", "pitch_mean", "bitrate", "compression_ratio",
+                          "energy_std", "symmetry", "kurtosis", "skew"))
+
+def load_cache(file_hash):
+    """读取分析缓存，未命中、版本不符或字段不全时返回 None"""
+    meta_path = os.path.join(CACHE_DIR, f"{file_hash}.json")
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or meta.get("version") != CACHE_VERSION:
+        return None
+    features = meta.get("features")
+    if "sr" not in meta or "duration" not in meta or not isinstance(features, dict) \
+            or not FEATURE_KEYS <= features.keys():
+        return None
+    try:
+        # 记录最近使用时间，供淘汰时参考
+        os.utime(meta_path)
+    except OSError:
+        pass
+    return meta
+
+def prune_cache(limit=CACHE_LIMIT):
+    """缓存目录超过上限时，按最近使用时间从旧到新删除文件"""
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if e.is_file()]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    for e in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(e.path)
+            total -= e.stat().st_size
+        except OSError:
+            pass
+
+def save_cache(file_hash, meta):
+    """写入分析缓存，失败时静默跳过"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(os.path.join(CACHE_DIR, f"{file_hash}.json"), "w", encoding="utf-8") as f:
+            json.dump(dict(meta, version=CACHE_VERSION), f, ensure_ascii=False)
+        prune_cache()
+    except OSError:
+        pass
+
+def compute_features(y, sr, duration, size_bytes, workers=-1, on_stft=None):
+    """从分析片段提取全部特征，返回可JSON序列化的字典。
+    workers 为 scipy.fft 线程数（批量分析时每个进程取1）；on_stft(S, sr) 在幅度谱算出后回调"""
+    librosa = import_librosa()
+    import scipy.fft
+    from yydb_kernels import signal_stats, frame_rms
+
+    # 全程保持float32/complex64：调用方传入其他精度时在入口统一转换一次，
+    # 避免后续每次归约和FFT都隐式提升到双精度
+    y = np.ascontiguousarray(y, dtype=np.float32)
+
+    # 基频估计在22.05kHz下已足够，降采样后yin的计算量减半；频谱中心与带宽必须看到11kHz以上的
+    # 高频内容（有损编码的低通截止），STFT与峰值、响度、统计矩、过零率一样使用原始采样率
+    if sr > ANALYSIS_SR:
+        y_a = librosa.resample(y, orig_sr=sr, target_sr=ANALYSIS_SR, res_type='polyphase')
+        sr_a = ANALYSIS_SR
+    else:
+        y_a, sr_a = y, sr
+
+    # FFT（scipy.fft多线程）与Numba核函数本身已并行，再套线程池只会争抢核心与缓存，按顺序计算
+    with scipy.fft.set_workers(workers):
+        # 只做一次STFT，幅度谱供频谱中心、带宽与起音包络共用
+        S = np.abs(librosa.stft(y, n_fft=2048, hop_length=512, dtype=np.complex64))
+        if on_stft is not None:
+            on_stft(S, sr)
+
+        # 频谱中心与带宽：一次 (2,频点)@(频点,帧数) 矩阵乘得到各帧的一、二阶频率矩，
+        # 带宽由 E[f²]-E[f]² 得出，不生成频点×帧数的中间矩阵；全零帧两者都为0，与librosa一致
+        freqs = np.fft.rfftfreq(2048, 1.0 / sr).astype(np.float32)
+        mag_sum = S.sum(axis=0) + 1e-9
+        m1, m2 = (np.stack([freqs, np.square(freqs)]) @ S) / mag_sum
+        spec_centroid = m1.mean()
+        spec_bw = np.sqrt(np.maximum(m2 - np.square(m1), 0)).mean()
+
+        # 与 onset_strength(y=...) 内部的梅尔功率谱一致，但直接复用上面的STFT；
+        # 估计BPM只需帧移1024：隔列取帧即等价于帧移1024的STFT，梅尔矩阵乘与差分工作量减半
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=np.square(S[:, ::2]), sr=sr,
+                                                                    dtype=np.float32))
+        onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=1024, aggregate=np.median)
+        tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr, hop_length=1024)[0]
+
+        # yin 每帧直接给出一个基频，不再生成 piptrack 的两个(1+n_fft/2)×帧数矩阵
+        pitch_mean = np.nanmean(librosa.yin(y_a, fmin=50, fmax=2000, sr=sr_a, frame_length=2048))
+
+    zero_crossings = librosa.feature.zero_crossing_rate(y)[0].mean()
+
+    # 峰值、静音比例、对称性、偏度、峰度合并为一次遍历
+    stats = signal_stats(y)
+    rms_all = frame_rms(y, 2048, 512)
+    rms = np.mean(rms_all)
+    peak = stats["peak"]
+    loudness_db = 20 * np.log10(rms + 1e-9)
+    dynamic_range = 20 * np.log10((peak + 1e-9) / (rms + 1e-9))
+    silent_ratio = stats["silent_ratio"]
+
+    bitrate = (size_bytes * 8) / duration / 1000
+    compression_ratio = size_bytes / (duration * sr * 2)
+
+    symmetry = stats["symmetry"]
+    energy_std = np.std(rms_all)
+    kurt = stats["kurtosis"]
+    skw = stats["skew"]
+
+    features = {
+        "loudness_db": loudness_db,
+        "dynamic_range": dynamic_range,
+        "silent_ratio": silent_ratio,
+        "spec_centroid": spec_centroid,
+        "spec_bw": spec_bw,
+        "tempo": tempo,
+        "zero_crossings": zero_crossings,
+        "pitch_mean": pitch_mean,
+        "bitrate": bitrate,
+        "compression_ratio": compression_ratio,
+        "energy_std": energy_std,
+        "symmetry": symmetry,
+        "kurtosis": kurt,
+        "skew": skw
+    }
+    return {k: float(v) for k, v in features.items()}
+
+_cuda_torch = None
+
+def cuda_torch():
+    """返回可用CUDA的torch模块，未安装torch或没有GPU时返回None（只检测一次）"""
+    global _cuda_torch
+    if _cuda_torch is None:
+        try:
+            import torch
+            _cuda_torch = torch if torch.cuda.is_available() else False
+        except ImportError:
+            _cuda_torch = False
+    return _cuda_torch or None
+
+def frames_power(frames, window, step, gpu_window=None):
+    """加窗帧 (帧数, n_fft) 的功率谱，每 step 帧平均为一列，返回 (列数, 频点)；
+    给出显存中的窗函数时在GPU上计算并在显存内取平均，只传回平均后的列，失败时回退到CPU"""
+    if gpu_window is not None:
+        torch = cuda_torch()
+        try:
+            with torch.no_grad():
+                P = torch.fft.rfft(torch.from_numpy(frames).cuda() * gpu_window).abs().square()
+                return P.reshape(-1, step, P.shape[1]).mean(dim=1).cpu().numpy()
+        except RuntimeError:
+            pass
+    import scipy.fft
+    P = np.square(np.abs(scipy.fft.rfft(frames * window, workers=-1)))
+    return P.reshape(-1, step, P.shape[1]).mean(axis=1)
+
+def stream_spectrogram(path, n_samples, n_fft=1024, max_cols=1200):
+    """流式计算显示用功率谱 (频点, 列数)：帧长等于帧移互不重叠，每 step 帧平均为一列，
+    最终不超过约 max_cols 列；工作集只有一个读取块，不再持有整首音频"""
+    step = max(1, (n_samples // n_fft) // max_cols)
+    group = n_fft * step
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)  # 周期汉宁窗，与librosa默认一致
+    gpu_window = None
+    torch = cuda_torch()
+    if torch is not None:
+        try:
+            gpu_window = torch.from_numpy(window).cuda()  # 只上传一次
+        except RuntimeError:
+            pass
+    # 每次主机与显存间传输都有固定开销，GPU上每块取约400万采样点（16MB）摊薄；CPU上取64K即可
+    target = 1 << 22 if gpu_window is not None else 1 << 16
+    blocksize = group * max(1, target // group)  # 恰为整列
+    cols = []
+    for block in iter_audio_blocks(path, blocksize):
+        pad = -len(block) % group
+        if pad:
+            block = np.pad(block, (0, pad))
+        cols.append(frames_power(block.reshape(-1, n_fft), window, step, gpu_window))
+    if not cols:
+        # 空文件：返回单列静音，频谱图显示为空白
+        return np.zeros((n_fft // 2 + 1, 1), dtype=np.float32)
+    return np.concatenate(cols).T
+
+def init_worker():
+    """批量分析工作进程初始化：预先导入librosa并设置FFT后端"""
+    import_librosa()
+    # 并行度由进程池提供，Numba核函数在进程内单线程执行，避免线程过量
+    import numba
+    numba.set_num_threads(1)
+
+def analyze_path(path):
+    """批量分析的工作进程入口，返回路径、哈希与特征；已分析过的文件直接读取缓存"""
+    with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        file_hash = hash_file(path, data=mm)
+        cached = load_cache(file_hash)
+        if cached is not None:
+            features = cached["features"]
+        else:
+            y, sr, n_total = load_audio(path, data=mm, max_duration=60.0)
+            duration = n_total / sr
+            # 并行度由进程池提供，进程内只用单线程FFT
+            features = compute_features(y, sr, duration, os.path.getsize(path), workers=1)
+            save_cache(file_hash, {
+                "sr": sr,
+                "duration": duration,
+                "features": features
+            })
+    return {"path": path, "hash": file_hash, "features": features}
+
+class PCMStream(io.RawIOBase):
+    """把内存中的int16 PCM包装成从指定采样帧开始的WAV文件流，按需读取，不复制音频数据"""
+    def __init__(self, pcm, sr, start_frame=0):
+        channels = pcm.shape[1]
+        self._data = memoryview(pcm).cast('B')[start_frame * channels * 2:]
+        size = len(self._data)
+        self._header = memoryview(struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + size, b'WAVE',
+                                              b'fmt ', 16, 1, channels, sr, sr * channels * 2,
+                                              channels * 2, 16, b'data', size))
+        self._size = len(self._header) + size
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, min(self._size, base + offset))
+        return self._pos
+
+    def readinto(self, b):
+        view = memoryview(b).cast('B')
+        n = 0
+        while n < len(view) and self._pos < self._size:
+            header_len = len(self._header)
+            if self._pos < header_len:
+                src = self._header[self._pos:]
+            else:
+                src = self._data[self._pos - header_len:]
+            k = min(len(src), len(view) - n)
+            view[n:n + k] = src[:k]
+            n += k
+            self._pos += k
+        return n
 
 class AudioAnalyzerApp:
     def __init__(self, root):
         self.root = root
         self.file_path = None
-        self.y = None
         self.sr = None
         self.duration = 0
         self.playing = False
         self.paused = False
+        self.play_offset = 0.0
+        self.dragging = False
+        self.seek_buffer = None
+        self.seek_pcm = None      # 流不支持定位时整首解码一次的 (PCM, 采样率)
+        self.seek_request = None  # 等待后台解码完成后要跳转到的位置
+        self.progress_job = None
+        self.analysis_running = False
+        self.batch_running = False  # 批量分析进行中时禁止再次启动任何分析
         self.score = 0
         self.score_detail = {}
+        self.features = {}
+        self.file_hash = None
+        self.spec_mag = None
         self.root.title("🎵 YYDB 音频分析器")
         self.root.geometry("950x770")
         self.root.resizable(False, False)
@@ -61,6 +450,7 @@ class AudioAnalyzerApp:
         self.setup_style()
         self.init_pygame()
         self.build_layout()
+        threading.Thread(target=preload_modules, daemon=True).start()
 
     def setup_style(self):
         default_font = ("Microsoft YaHei", 10)
@@ -169,6 +559,9 @@ class AudioAnalyzerApp:
         self.select_btn = ttk.Button(top, text="选择音频", command=self.choose_file)
         self.select_btn.pack(side=tk.LEFT)
 
+        self.folder_btn = ttk.Button(top, text="分析文件夹", command=self.choose_folder)
+        self.folder_btn.pack(side=tk.LEFT, padx=(10, 0))
+
         self.analyze_btn = ttk.Button(top, text="分析", command=self.start_analysis, state=tk.DISABLED)
         self.analyze_btn.pack(side=tk.RIGHT)
 
@@ -226,6 +619,8 @@ class AudioAnalyzerApp:
         
         self.spectrum_tab = tk.Frame(spec_frame, bg=self.bg)
         self.spectrum_tab.pack(fill=tk.BOTH, expand=True)
+        self.spec_label = None
+        self.spec_photo = None
 
         # 播放控制区域
         play_frame = tk.LabelFrame(right_panel, text="播放控制", bg=self.bg, fg=self.fg, font=("Segoe UI", 10, "bold"))
@@ -276,9 +671,10 @@ class AudioAnalyzerApp:
             to=100,
             orient='horizontal',
             variable=self.progress_var,
-            command=self.seek_audio,
             style='TScale')
         self.progress_bar.pack(fill=tk.X, pady=(0, 5))
+        self.progress_bar.bind("<ButtonPress-1>", self.start_seek)
+        self.progress_bar.bind("<ButtonRelease-1>", self.end_seek)
         
         time_frame = tk.Frame(progress_frame, bg=self.bg)
         time_frame.pack(fill=tk.X)
@@ -348,30 +744,31 @@ class AudioAnalyzerApp:
         path = event.data.strip('{}')  # 去除Windows路径可能包含的花括号
         if os.path.isfile(path):
             ext = os.path.splitext(path)[1].lower()
-            supported_exts = ['.mp3', '.flac', '.wav', '.m4a', '.ape', '.dsf', 
-                            '.dsd', '.dff', '.aac', '.ogg', '.opus', '.wma', 
-                            '.aiff', '.aif', '.au', '.raw', '.pcm', '.caf', 
-                            '.tta', '.wv']
-            if ext in supported_exts:
+            if ext in SUPPORTED_EXTS:
                 self.file_path = path
                 self.path_label.config(text=os.path.basename(path))
-                self.analyze_btn.config(state=tk.NORMAL)
+                if not self.batch_running:
+                    self.analyze_btn.config(state=tk.NORMAL)
                 self.reset_player()
             else:
                 messagebox.showerror("错误", f"不支持的文件类型: {ext}")
 
     def choose_file(self):
-        path = filedialog.askopenfilename(filetypes=[("音频文件", "*.mp3 *.flac *.wav *.m4a *.ape *.dsf *.dsd *.dff *.aac *.ogg *.opus *.wma *.aiff *.aif *.au *.raw *.pcm *.caf *.tta *.wv")])
+        path = filedialog.askopenfilename(filetypes=[("音频文件", " ".join("*" + ext for ext in SUPPORTED_EXTS))])
         if path:
             self.file_path = path
             self.path_label.config(text=os.path.basename(path))
-            self.analyze_btn.config(state=tk.NORMAL)
+            if not self.batch_running:
+                self.analyze_btn.config(state=tk.NORMAL)
             self.reset_player()
 
     def reset_player(self):
         pygame.mixer.music.stop()
         self.playing = False
         self.paused = False
+        self.seek_buffer = None
+        self.seek_pcm = None
+        self.seek_request = None
         self.progress_var.set(0)
         self.current_time.config(text="00:00")
         self.total_time.config(text="/ 00:00")
@@ -381,9 +778,12 @@ class AudioAnalyzerApp:
             return
         pygame.mixer.music.load(self.file_path)
         pygame.mixer.music.play()
+        self.seek_buffer = None
+        self.seek_request = None
+        self.play_offset = 0.0
         self.playing = True
         self.paused = False
-        threading.Thread(target=self.track_progress, daemon=True).start()
+        self.schedule_progress()
 
     def pause_audio(self):
         if self.playing:
@@ -397,230 +797,408 @@ class AudioAnalyzerApp:
 
     def stop_audio(self):
         pygame.mixer.music.stop()
+        self.seek_buffer = None
+        self.seek_request = None
         self.playing = False
         self.paused = False
         self.progress_var.set(0)
         self.current_time.config(text="00:00")
         self.total_time.config(text="/ 00:00")
 
+    def start_seek(self, event):
+        self.dragging = True
+
+    def end_seek(self, event):
+        # 拖动过程中不跳转，松开鼠标时只跳转一次
+        self.dragging = False
+        self.seek_audio(self.progress_var.get())
+
     def seek_audio(self, val):
-        if self.y is None or self.sr is None or self.duration <= 0:
+        if not self.file_path or self.duration <= 0:
             return
-            
+
         try:
             # 确保值在0-100范围内
             pos = max(0, min(100, float(val)))
             seek_time = (pos / 100.0) * self.duration
-            
-            # 计算开始采样点
-            start_sample = int(seek_time * self.sr)
-            if start_sample >= len(self.y):
-                return
-                
-            # 创建临时文件
-            temp_dir = os.path.join(os.path.dirname(self.file_path), "temp")
-            os.makedirs(temp_dir, exist_ok=True)
-            temp_path = os.path.join(temp_dir, f"seek_temp_{time.time()}.wav")
-            
-            # 使用soundfile替代librosa.output.write_wav
-            import soundfile as sf
-            sf.write(temp_path, self.y[start_sample:], self.sr)
-            
-            # 停止当前播放并加载新位置
-            pygame.mixer.music.stop()
-            pygame.mixer.music.load(temp_path)
-            pygame.mixer.music.play()
-            
-            # 更新播放状态
-            self.playing = True
-            self.paused = False
-            
-            # 删除旧临时文件
-            for f in os.listdir(temp_dir):
-                if f.startswith("seek_temp_") and f.endswith(".wav"):
-                    try:
-                        os.remove(os.path.join(temp_dir, f))
-                    except:
-                        pass
-                        
+
+            if self.playing:
+                # 直接在当前音频流中跳转，无需重写临时文件
+                try:
+                    pygame.mixer.music.set_pos(seek_time)
+                    # get_pos() 从play()开始计时，不受set_pos影响
+                    self.play_offset = seek_time - pygame.mixer.music.get_pos() / 1000.0
+                except pygame.error:
+                    self.play_from(seek_time)
+                    self.paused = False
+            else:
+                pygame.mixer.music.load(self.file_path)
+                self.play_from(seek_time)
+                self.playing = True
+                self.paused = False
+                self.schedule_progress()
+
         except Exception as e:
             print(f"跳转播放出错：{str(e)}")
             self.status_label.config(text=f"跳转出错：{str(e)}")
 
+    def play_from(self, seek_time):
+        """从指定位置开始播放；流不支持定位时改用内存中整首解码一次的PCM"""
+        try:
+            pygame.mixer.music.play(start=seek_time)
+            self.play_offset = seek_time
+        except pygame.error:
+            # 部分SDL_mixer版本无法定位WAV等格式：整首只在后台解码一次，
+            # 之后每次跳转只需构造一个从定位点读取的WAV流，不复制数据、不写临时文件
+            if self.seek_pcm is not None:
+                self.play_pcm(seek_time)
+                return
+            first_request = self.seek_request is None
+            self.seek_request = seek_time
+            if first_request:
+                threading.Thread(target=self.decode_for_seek, args=(self.file_path,), daemon=True).start()
+
+    def decode_for_seek(self, path):
+        try:
+            with sf.SoundFile(path) as f:
+                pcm = (f.read(dtype='int16', always_2d=True), f.samplerate)
+            error = None
+        except Exception as e:
+            # 含长时间高采样率音频整首解码时的 MemoryError；无论成败都要投递 _done，否则跳转会一直挂起
+            pcm = None
+            error = str(e) or type(e).__name__
+
+        def _done():
+            if path != self.file_path:
+                return  # 解码期间已换了文件
+            seek_time, self.seek_request = self.seek_request, None
+            try:
+                if pcm is None:
+                    raise RuntimeError(error)
+                self.seek_pcm = pcm
+                if seek_time is not None:
+                    self.play_pcm(seek_time)
+                    self.playing = True
+                    self.paused = False
+                    self.schedule_progress()
+            except Exception as e:
+                self.status_label.config(text=f"跳转出错：{str(e)}")
+
+        self.root.after(0, _done)
+
+    def play_pcm(self, seek_time):
+        pcm, sr = self.seek_pcm
+        start = min(int(seek_time * sr), len(pcm))
+        self.seek_buffer = PCMStream(pcm, sr, start)  # pygame按需读取，需保持引用
+        pygame.mixer.music.load(self.seek_buffer, "wav")
+        pygame.mixer.music.play()
+        self.seek_request = None
+        self.play_offset = seek_time
+
+    def schedule_progress(self):
+        if self.progress_job is not None:
+            self.root.after_cancel(self.progress_job)
+        self.progress_job = self.root.after(100, self.track_progress)
+
     def track_progress(self):
-        while self.playing:
-            if not self.paused:
-                elapsed = pygame.mixer.music.get_pos() / 1000.0
-                try:
-                    percent = (elapsed / self.duration) * 100
-                    self.progress_var.set(percent)
-                    self.current_time.config(text=self.format_time(elapsed))
-                    self.total_time.config(text=f"/ {self.format_time(self.duration)}")
-                except:
-                    pass
-            time.sleep(0.5)
+        """在Tk事件循环中定时刷新播放进度，不再使用后台线程"""
+        self.progress_job = None
+        if not self.playing:
+            return
+        if self.seek_request is not None:
+            # 正在后台解码以便跳转，解码完成后再继续刷新
+            self.progress_job = self.root.after(100, self.track_progress)
+            return
+        if not self.paused and not pygame.mixer.music.get_busy():
+            # 播放结束，停止刷新
+            self.stop_audio()
+            return
+        if not self.paused and not self.dragging:
+            elapsed = self.play_offset + pygame.mixer.music.get_pos() / 1000.0
+            try:
+                percent = (elapsed / self.duration) * 100
+                self.progress_var.set(percent)
+                self.current_time.config(text=self.format_time(elapsed))
+                self.total_time.config(text=f"/ {self.format_time(self.duration)}")
+            except:
+                pass
+        self.progress_job = self.root.after(100, self.track_progress)
 
     def format_time(self, seconds):
         minutes = int(seconds // 60)
         seconds = int(seconds % 60)
         return f"{minutes:02}:{seconds:02}"
 
+    def set_status(self, text):
+        """分析在后台线程执行，界面更新统一投递到Tk主线程"""
+        self.root.after(0, lambda: self.status_label.config(text=text))
+
+    def set_progress(self, value):
+        self.root.after(0, lambda: self.overall_progress.config(value=value))
+
     def start_analysis(self):
+        if self.batch_running or self.analysis_running:
+            return
         threading.Thread(target=self.analyze_file, daemon=True).start()
 
     def analyze_file(self):
+        # 分析期间用户可能换了文件：路径只在开始时读取一次，之后都使用这份
+        path = self.file_path
+        if not path:
+            return
+
         self.analysis_start_time = time.time()
         self.analysis_running = True
-        self.timer_thread = threading.Thread(target=self.update_timer, daemon=True)
-        self.timer_thread.start()
-        self.status_label.config(text="开始分析...")
-        self.time_label.config(text="用时: 0.00秒")
-        self.overall_progress['value'] = 0
-        self.overall_progress.update()
+        self.root.after(0, self.update_timer)
+        self.set_status("开始分析...")
+        self.set_progress(0)
 
-        if not self.file_path:
+        try:
+            # 文件只映射一次：哈希与解码共用同一份页缓存，文件内容只从磁盘读取一遍
+            with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.set_status("计算文件哈希...")
+                self.file_hash = hash_file(path, data=mm)
+                cached = load_cache(self.file_hash)
+                if cached is not None:
+                    # 命中缓存：跳过解码与特征提取
+                    self.set_status("读取分析缓存...")
+                    self.sr = cached["sr"]
+                    self.duration = cached["duration"]
+                    self.features = cached["features"]
+                    self.spec_mag = None
+                    threading.Thread(target=self.draw_spectrum, daemon=True).start()
+                else:
+                    self.features = self.extract_features(path, mm)
+                    save_cache(self.file_hash, {
+                        "sr": self.sr,
+                        "duration": self.duration,
+                        "features": self.features
+                    })
+            self.set_progress(60)
+
+            self.set_status("评分分析...")
+            points = score_features(self.features)
+            self.score_detail = dict(zip(SCORE_KEYS, points.tolist()))
+            self.score = int(points.sum())
+            self.set_progress(80)
+
+            self.root.after(0, self.show_results)
+            self.set_progress(100)
+            self.set_status("分析完成")
+        except Exception as e:
+            self.set_status(f"分析出错：{str(e)}")
+        finally:
+            # 出错时也要停止计时器的after调度
+            self.analysis_running = False
+
+    def extract_features(self, path, data):
+        """解码已映射到内存的音频并提取全部特征，返回可JSON序列化的字典"""
+        self.set_status("加载音频文件...")
+        # 只解码分析用的前60秒；时长取自文件头的采样点数，频谱图另行流式读取
+        # 分析片段只在本函数内使用，不挂在实例上，返回后即释放
+        y, self.sr, n_total = load_audio(path, data=data, max_duration=60.0)
+        self.duration = n_total / self.sr
+        self.set_progress(10)
+
+        self.set_status("提取音频特征...")
+        # 文件大小取自映射本身，与哈希对应的是同一份内容
+        features = compute_features(y, self.sr, self.duration, len(data),
+                                    on_stft=self.start_spectrum)
+        self.set_progress(40)
+        return features
+
+    def start_spectrum(self, S, sr):
+        # 整首都在分析片段内时频谱图才会复用该幅度谱，否则不保留
+        self.spec_mag = S if sr == self.sr and self.duration <= 60.0 else None
+        # 异步绘制频谱图，避免卡界面
+        threading.Thread(target=self.draw_spectrum, daemon=True).start()
+
+    def choose_folder(self):
+        if self.batch_running or self.analysis_running:
+            return
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        paths = [os.path.join(d, name)
+                 for d, _, names in os.walk(folder)
+                 for name in sorted(names)
+                 if os.path.splitext(name)[1].lower() in SUPPORTED_EXTS]
+        if not paths:
+            messagebox.showinfo("提示", "文件夹中没有支持的音频文件。")
+            return
+        # 每次批量分析都会启动一整个进程池，运行期间禁用分析按钮，避免重复启动
+        self.batch_running = True
+        self.folder_btn.config(state=tk.DISABLED)
+        self.analyze_btn.config(state=tk.DISABLED)
+        threading.Thread(target=self.analyze_folder, args=(paths,), daemon=True).start()
+
+    def end_batch(self):
+        self.batch_running = False
+        self.folder_btn.config(state=tk.NORMAL)
+        if self.file_path:
+            self.analyze_btn.config(state=tk.NORMAL)
+
+    def analyze_folder(self, paths):
+        """多进程并行分析多个文件，每完成一个更新一次进度"""
+        try:
+            self.set_status(f"批量分析 {len(paths)} 个文件...")
+            self.set_progress(0)
+            results = []
+            failed = []
+            with ProcessPoolExecutor(initializer=init_worker) as pool:
+                futures = {pool.submit(analyze_path, path): path for path in paths}
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        results.append(future.result())
+                    except Exception:
+                        failed.append(futures[future])
+                    self.set_progress(done * 100 / len(paths))
+
+            if results:
+                results.sort(key=lambda r: r["path"])
+                # 所有文件一次性向量化评分
+                points = score_features({k: [r["features"][k] for r in results] for k in results[0]["features"]})
+                for r, pts in zip(results, points.T.tolist()):
+                    r["score_detail"] = dict(zip(SCORE_KEYS, pts))
+                    r["score"] = sum(pts)
+        except Exception as e:
+            self.set_status(f"批量分析出错：{str(e)}")
+            self.root.after(0, self.end_batch)
             return
+        self.root.after(0, lambda: self.show_batch_results(results, failed))
+
+    def show_batch_results(self, results, failed):
+        self.end_batch()
+        info_lines = [f"{os.path.basename(r['path'])}: {r['score']}/100" for r in results]
+        info_lines += [f"{os.path.basename(path)}: 分析失败" for path in failed]
+        score_lines = [f"已分析: {len(results)} 个文件"]
+        if results:
+            score_lines.append(f"平均评分: {sum(r['score'] for r in results) / len(results):.1f}/100")
+        if failed:
+            score_lines.append(f"失败: {len(failed)} 个文件")
 
         self.info_text.delete(1.0, tk.END)
+        self.info_text.insert(tk.END, "\n".join(info_lines) + "\n")
         self.score_text.delete(1.0, tk.END)
-        self.info_text.insert(tk.END, f"文件: {self.file_path}\n")
-
-        # 基本信息
-        size_mb = round(os.path.getsize(self.file_path)/(1024*1024), 2)
-        self.info_text.insert(tk.END, f"大小: {size_mb} MB\n")
+        self.score_text.insert(tk.END, "\n".join(score_lines) + "\n")
+        self.status_label.config(text="批量分析完成")
 
-        self.status_label.config(text="加载音频文件...")
-        self.y, self.sr = librosa.load(self.file_path, sr=None, mono=True, duration=60.0)  # 用于分析
-        self.y_full, _ = librosa.load(self.file_path, sr=None, mono=True)  # 用于频谱图绘制
-        self.duration = sf.info(self.file_path).duration
-        self.info_text.insert(tk.END, f"采样率: {self.sr} Hz\n")
-        self.info_text.insert(tk.END, f"时长: {self.format_time(self.duration)}\n")
-        self.overall_progress['value'] = 10
-        self.overall_progress.update()
-
-        # 异步绘制频谱图，避免卡界面
-        threading.Thread(target=self.draw_spectrum, daemon=True).start()
+        if not results or not messagebox.askyesno("批量分析完成", "是否导出批量分析报告？"):
+            return
+        save_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON 文件", "*.json")])
+        if not save_path:
+            return
+        try:
+            report = [{
+                "路径": r["path"],
+                "哈希": r["hash"],
+                "综合评分": r["score"],
+                "评分明细": r["score_detail"],
+                "音频特征": r["features"]
+            } for r in results]
+            with open(save_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4, ensure_ascii=False)
+            messagebox.showinfo("导出成功", f"已保存到：{save_path}")
+        except Exception as e:
+            messagebox.showerror("导出失败", str(e))
 
-        self.status_label.config(text="提取音频特征...")
-        with ThreadPoolExecutor() as executor:
-            rms_future = executor.submit(librosa.feature.rms, y=self.y)
-            zcr_future = executor.submit(librosa.feature.zero_crossing_rate, y=self.y)
-            pitch_future = executor.submit(librosa.piptrack, y=self.y, sr=self.sr)
-            spec_centroid_future = executor.submit(librosa.feature.spectral_centroid, y=self.y, sr=self.sr)
-            spec_bw_future = executor.submit(librosa.feature.spectral_bandwidth, y=self.y, sr=self.sr)
-            onset_env = librosa.onset.onset_strength(y=self.y, sr=self.sr)
-            tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=self.sr)[0]
-
-            rms_all = rms_future.result()[0]
-            rms = np.mean(rms_all)
-            peak = np.max(np.abs(self.y))
-            loudness_db = 20 * np.log10(rms + 1e-9)
-            dynamic_range = 20 * np.log10((peak + 1e-9) / (rms + 1e-9))
-            self.info_text.insert(tk.END, f"响度: {loudness_db:.2f} dB\n")
-            self.info_text.insert(tk.END, f"动态范围: {dynamic_range:.2f} dB\n")
-
-            silent_ratio = np.mean(np.abs(self.y) < 1e-4)
-            self.info_text.insert(tk.END, f"静音比例: {silent_ratio:.2%}\n")
-
-            spec_centroid = spec_centroid_future.result().mean()
-            self.info_text.insert(tk.END, f"频谱中心: {spec_centroid:.1f} Hz\n")
-            spec_bw = spec_bw_future.result().mean()
-            self.info_text.insert(tk.END, f"频谱带宽: {spec_bw:.1f} Hz\n")
-            self.info_text.insert(tk.END, f"节拍: {tempo:.1f} BPM\n")
-
-            zero_crossings = zcr_future.result()[0].mean()
-            self.info_text.insert(tk.END, f"过零率: {zero_crossings:.4f}\n")
-
-            pitches, magnitudes = pitch_future.result()
-            pitch_values = pitches[magnitudes > np.median(magnitudes)]
-            pitch_mean = pitch_values.mean() if len(pitch_values) > 0 else 0
-            self.info_text.insert(tk.END, f"基频: {pitch_mean:.1f} Hz\n")
-
-        self.overall_progress['value'] = 50
-        self.overall_progress.update()
-
-        self.status_label.config(text="计算码率与压缩率...")
-        size_bytes = os.path.getsize(self.file_path)
-        bitrate = (size_bytes * 8) / self.duration / 1000
-        compression_ratio = size_bytes / (self.duration * self.sr * 2)
-        file_hash = hashlib.md5(open(self.file_path, 'rb').read()).hexdigest()
-        self.info_text.insert(tk.END, f"估算比特率: {bitrate:.1f} kbps\n")
-        self.info_text.insert(tk.END, f"压缩率: {compression_ratio:.2f}\n")
-        self.info_text.insert(tk.END, f"文件哈希: \n{file_hash}\n")
-        self.overall_progress['value'] = 60
-        self.overall_progress.update()
-
-        self.status_label.config(text="评分分析...")
-        self.score_detail = {
-            "比特率": 20 if bitrate > 256 else 10,
-            "动态范围": 20 if dynamic_range > 12 else 10,
-            "编码质量": 20 if bitrate > 256 else 10,
-            "响度与动态": 20 if loudness_db > -18 and dynamic_range > 12 else 10,
-            "结构完整性": 20 if spec_bw > 1000 else 10
-        }
-        self.score = sum(self.score_detail.values())
-        self.overall_progress['value'] = 70
-        self.overall_progress.update()
-
-        self.status_label.config(text="统计信号特征...")
-        symmetry = np.mean(self.y[self.y > 0]) - np.mean(self.y[self.y < 0])
-        energy_std = np.std(rms_all)
-        kurt = kurtosis(self.y)
-        skw = skew(self.y)
-        self.info_text.insert(tk.END, f"能量变化率: {energy_std:.4f}\n")
-        self.info_text.insert(tk.END, f"信号对称性: {symmetry:.4f}\n")
-        self.info_text.insert(tk.END, f"峰度（kurtosis）: {kurt:.4f}\n")
-        self.info_text.insert(tk.END, f"偏度（skew）: {skw:.4f}\n")
-        self.overall_progress['value'] = 80
-        self.overall_progress.update()
-
-        self.score_text.insert(tk.END, f"综合评分：{self.score}/100\n\n")
-        for k, v in self.score_detail.items():
-            self.score_text.insert(tk.END, f"{k}: {v}/20\n")
+    def show_results(self):
+        feat = self.features
+        size_mb = round(os.path.getsize(self.file_path)/(1024*1024), 2)
+        # 拼接成完整文本后一次性插入，避免逐行插入引起多次重排
+        info_lines = [
+            f"文件: {self.file_path}",
+            f"大小: {size_mb} MB",
+            f"采样率: {self.sr} Hz",
+            f"时长: {self.format_time(self.duration)}",
+            f"响度: {feat['loudness_db']:.2f} dB",
+            f"动态范围: {feat['dynamic_range']:.2f} dB",
+            f"静音比例: {feat['silent_ratio']:.2%}",
+            f"频谱中心: {feat['spec_centroid']:.1f} Hz",
+            f"频谱带宽: {feat['spec_bw']:.1f} Hz",
+            f"节拍: {feat['tempo']:.1f} BPM",
+            f"过零率: {feat['zero_crossings']:.4f}",
+            f"基频: {feat['pitch_mean']:.1f} Hz",
+            f"估算比特率: {feat['bitrate']:.1f} kbps",
+            f"压缩率: {feat['compression_ratio']:.2f}",
+            f"文件哈希: \n{self.file_hash}",
+            f"能量变化率: {feat['energy_std']:.4f}",
+            f"信号对称性: {feat['symmetry']:.4f}",
+            f"峰度（kurtosis）: {feat['kurtosis']:.4f}",
+            f"偏度（skew）: {feat['skew']:.4f}"
+        ]
+        score_lines = [f"综合评分：{self.score}/100", ""]
+        score_lines += [f"{k}: {v}/20" for k, v in self.score_detail.items()]
 
-        self.analysis_running = False
-        self.timer_thread.join()
-        self.overall_progress['value'] = 100
-        self.status_label.config(text="分析完成")
+        self.info_text.delete(1.0, tk.END)
+        self.info_text.insert(tk.END, "\n".join(info_lines) + "\n")
+        self.score_text.delete(1.0, tk.END)
+        self.score_text.insert(tk.END, "\n".join(score_lines) + "\n")
 
     def draw_spectrum(self):
-        if self.y is None or self.sr is None:
+        if self.file_hash is None or self.sr is None:
             return
 
         def _plot():
-            import matplotlib
-            matplotlib.use("Agg")
-            import matplotlib.pyplot as plt
-            import librosa.display
-            D = librosa.amplitude_to_db(
-                np.abs(librosa.stft(self.y_full, n_fft=1024, hop_length=1024)), ref=np.max)
-
-            fig = plt.figure(facecolor=self.text_bg)
-            ax = fig.add_subplot(111)
-            librosa.display.specshow(D, sr=self.sr, x_axis='time', y_axis='log', cmap='magma', ax=ax)
-            fig.tight_layout(pad=0.2)
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight', pad_inches=0.05, dpi='figure')
-            plt.close(fig)
-            buf.seek(0)
-            pil_image = Image.open(buf)
-            img_width = self.spectrum_tab.winfo_width() - 20
-            if img_width > 0:
-                pil_image = pil_image.resize((img_width, int(pil_image.height * img_width / pil_image.width)))
-            img_tk = ImageTk.PhotoImage(pil_image)
+            # 频谱图按文件哈希缓存为PNG，再次打开同一文件时跳过STFT与绘制
+            spec_path = os.path.join(CACHE_DIR, f"{self.file_hash}.png")
+            try:
+                pil_image = Image.open(spec_path)
+                pil_image.load()
+                os.utime(spec_path)  # 记录最近使用时间，供淘汰时参考
+            except OSError:
+                pil_image = self.render_spectrum()
+                try:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    pil_image.save(spec_path)
+                    prune_cache()
+                except OSError:
+                    pass
+            # 频谱图已生成，分析阶段保留的幅度谱不再需要，立即释放
+            self.spec_mag = None
 
             def _display():
-                for child in self.spectrum_tab.winfo_children():
-                    child.destroy()
-                label = tk.Label(self.spectrum_tab, image=img_tk, bg=self.bg, anchor='center')
-                label.image = img_tk
-                label.pack(fill=tk.BOTH, expand=True)
-
-            self.root.after(0, _display)
+                img = pil_image
+                img_width = self.spectrum_tab.winfo_width() - 20
+                if img_width > 0:
+                    img = img.resize((img_width, int(img.height * img_width / img.width)))
+                if self.spec_label is None:
+                    self.spec_label = tk.Label(self.spectrum_tab, bg=self.bg, anchor='center')
+                    self.spec_label.pack(fill=tk.BOTH, expand=True)
+                if self.spec_photo is not None and (self.spec_photo.width(), self.spec_photo.height()) == img.size:
+                    # 尺寸不变时复用已有PhotoImage，只更新像素，标签无需重新配置
+                    self.spec_photo.paste(img)
+                else:
+                    self.spec_photo = ImageTk.PhotoImage(img)
+                    self.spec_label.configure(image=self.spec_photo)
+
+            # 等界面空闲（结果文本等已布局完成）后再贴图，与其他待处理的重绘合并为一次
+            self.root.after_idle(_display)
 
         threading.Thread(target=_plot, daemon=True).start()
 
-        
+    def render_spectrum(self):
+        librosa = import_librosa()
+        magma = import_colormap()
+
+        if self.spec_mag is not None:
+            # 整首音频都在分析片段内，直接复用分析阶段的幅度谱；显示宽度有限，超过约1200列没有意义
+            step = max(1, self.spec_mag.shape[1] // 1200)
+            P = np.square(self.spec_mag[:, ::step])
+        else:
+            P = stream_spectrogram(self.file_path, int(self.duration * self.sr))
+        D = librosa.power_to_db(P, ref=np.max)
+
+        # 按对数频率取行，保持 y_axis='log' 的观感（跳过直流分量）
+        rows = np.geomspace(1, D.shape[0] - 1, num=SPEC_SIZE[1]).astype(np.intp)
+        D = D[rows]
+        # 归一化后直接查色表得到RGBA像素，不经过matplotlib的Figure/Axes绘制
+        norm = (D - D.min()) / (np.ptp(D) + 1e-9)
+        rgba = magma(norm, bytes=True)
+        # 低频在下
+        pil_image = Image.fromarray(np.ascontiguousarray(rgba[::-1]), 'RGBA')
+        return pil_image.resize(SPEC_SIZE, Image.BILINEAR)
+
     def show_about(self):
         about_win = tk.Toplevel(self.root)
         about_win.title("关于 YYDB 音频分析器")
@@ -700,39 +1278,40 @@ class AudioAnalyzerApp:
         close_btn.pack(pady=10)
 
     def update_timer(self):
-        """更新计时器显示"""
-        while self.analysis_running:
-            elapsed = time.time() - self.analysis_start_time
-            self.time_label.config(text=f"用时: {elapsed:.2f}秒")
-            time.sleep(0.1)
+        """更新计时器显示，由Tk主线程每100毫秒调度一次"""
+        elapsed = time.time() - self.analysis_start_time
+        self.time_label.config(text=f"用时: {elapsed:.2f}秒")
+        if self.analysis_running:
+            self.root.after(100, self.update_timer)
 
     def export_report(self):
-        if not self.file_path or self.y is None:
+        if not self.file_path or not self.features:
             messagebox.showwarning("提示", "请先分析音频。")
             return
         save_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON 文件", "*.json")])
         if not save_path:
             return
         try:
-            # 收集所有分析数据
+            # 收集所有分析数据（直接复用分析阶段的特征，不再重新计算）
+            feat = self.features
             report = {
                 "文件信息": {
                     "路径": self.file_path,
                     "文件名": os.path.basename(self.file_path),
                     "大小(MB)": round(os.path.getsize(self.file_path)/(1024*1024), 2),
-                    "哈希": hash_file(self.file_path),
+                    "哈希": self.file_hash,
                     "分析时间": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 },
                 "音频特征": {
                     "时长(秒)": round(self.duration, 2),
                     "采样率(Hz)": self.sr,
-                    "比特率(kbps)": round((os.path.getsize(self.file_path)*8)/self.duration/1000, 1),
-                    "响度(dB)": round(20*np.log10(np.sqrt(np.mean(self.y**2))+1e-9), 2),
-                    "动态范围(dB)": round(20*np.log10((np.max(np.abs(self.y))+1e-9)/(np.sqrt(np.mean(self.y**2))+1e-9)), 2),
-                    "频谱中心(Hz)": round(librosa.feature.spectral_centroid(y=self.y, sr=self.sr).mean(), 1),
-                    "频谱带宽(Hz)": round(librosa.feature.spectral_bandwidth(y=self.y, sr=self.sr).mean(), 1),
-                    "节拍(BPM)": round(float(librosa.beat.tempo(y=self.y, sr=self.sr)[0]), 1),
-                    "静音比例": round(np.mean(np.abs(self.y) < 1e-4), 4)
+                    "比特率(kbps)": round(feat["bitrate"], 1),
+                    "响度(dB)": round(feat["loudness_db"], 2),
+                    "动态范围(dB)": round(feat["dynamic_range"], 2),
+                    "频谱中心(Hz)": round(feat["spec_centroid"], 1),
+                    "频谱带宽(Hz)": round(feat["spec_bw"], 1),
+                    "节拍(BPM)": round(feat["tempo"], 1),
+                    "静音比例": round(feat["silent_ratio"], 4)
                 },
                 "评分结果": {
                     "综合评分": self.score,
@@ -746,10 +1325,10 @@ class AudioAnalyzerApp:
                     }
                 },
                 "高级统计": {
-                    "能量变化率": round(np.std(librosa.feature.rms(y=self.y)), 4),
-                    "信号对称性": round(np.mean(self.y[self.y>0])-np.mean(self.y[self.y<0]), 4),
-                    "峰度": round(float(kurtosis(self.y)), 4),
-                    "偏度": round(float(skew(self.y)), 4)
+                    "能量变化率": round(feat["energy_std"], 4),
+                    "信号对称性": round(feat["symmetry"], 4),
+                    "峰度": round(feat["kurtosis"], 4),
+                    "偏度": round(feat["skew"], 4)
                 }
             }
             with open(save_path, "w", encoding="utf-8") as f:
@@ -793,6 +1372,8 @@ class AudioAnalyzerApp:
         ctypes.windll.user32.SetWindowLongPtrW(hwnd, GWL_WNDPROC, self.new_wndproc)
 
 if __name__ == '__main__':
+    # 打包为exe后批量分析的工作进程需要
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = AudioAnalyzerApp(root)
     root.mainloop()
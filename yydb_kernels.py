@@ -0,0 +1,103 @@
+# YYDB 音频分析器的 Numba 核函数，由 yydb.py 在首次分析时延迟导入，
+# 避免启动时加载 numba/llvmlite
+import sys
+import threading
+
+import numpy as np
+from numba import njit, prange
+
+# 默认的 workqueue 线程层不允许多个Python线程同时启动并行核函数，
+# 后台预热与分析线程可能同时调用，统一串行化
+_launch_lock = threading.Lock()
+
+# cache=True 需要磁盘上的 .py 源文件定位缓存；PyInstaller 打包后只有字节码，
+# 装饰器会直接抛出 "no locator available"，打包运行时关闭磁盘缓存，由后台预热提前编译
+_CACHE = not getattr(sys, 'frozen', False)
+
+
+@njit(cache=_CACHE, fastmath=True, nogil=True, boundscheck=False, parallel=True)
+def _signal_moments(y, silent_thr):
+    """单次并行遍历归约峰值、静音点数、正负半波和与计数，以及一至四阶原点矩"""
+    n = y.size
+    s1 = 0.0
+    s2 = 0.0
+    s3 = 0.0
+    s4 = 0.0
+    peak = 0.0
+    silent_cnt = 0
+    pos_sum = 0.0
+    pos_cnt = 0
+    neg_sum = 0.0
+    neg_cnt = 0
+    for i in prange(n):
+        x = y[i]
+        a = abs(x)
+        peak = max(peak, a)
+        silent_cnt += 1 if a < silent_thr else 0
+        # 矩的累加用双精度，峰值与静音判断保持样本精度
+        v = np.float64(x)
+        v2 = v * v
+        s1 += v
+        s2 += v2
+        s3 += v2 * v
+        s4 += v2 * v2
+        pos_sum += max(v, 0.0)
+        pos_cnt += 1 if v > 0 else 0
+        neg_sum += min(v, 0.0)
+        neg_cnt += 1 if v < 0 else 0
+    # 由原点矩换算中心矩（音频均值接近0，双精度下不存在明显的抵消误差）
+    mean = s1 / n
+    e2 = s2 / n
+    e3 = s3 / n
+    e4 = s4 / n
+    m2 = e2 - mean * mean
+    m3 = e3 - 3.0 * mean * e2 + 2.0 * mean ** 3
+    m4 = e4 - 4.0 * mean * e3 + 6.0 * mean * mean * e2 - 3.0 * mean ** 4
+    return (peak, silent_cnt, pos_sum, pos_cnt, neg_sum, neg_cnt, m2, m3, m4)
+
+
+@njit(cache=_CACHE, fastmath=True, nogil=True, boundscheck=False, parallel=True)
+def _frame_rms(y, frame_length, hop_length):
+    n = y.size
+    half = frame_length // 2
+    n_frames = 1 + n // hop_length
+    out = np.empty(n_frames, dtype=np.float32)
+    for t in prange(n_frames):
+        start = t * hop_length - half
+        lo = max(start, 0)
+        hi = min(start + frame_length, n)
+        acc = 0.0
+        for i in range(lo, hi):
+            acc += y[i] * y[i]
+        out[t] = np.sqrt(acc / frame_length)
+    return out
+
+
+def frame_rms(y, frame_length, hop_length):
+    """分帧均方根，等价于 librosa.feature.rms(center=True, pad_mode='constant')"""
+    with _launch_lock:
+        return _frame_rms(y, frame_length, hop_length)
+
+
+def signal_stats(y, silent_thr=1e-4):
+    """峰值、静音比例、对称性、偏度与峰度（与scipy默认的有偏Fisher定义一致）"""
+    # 阈值转换为与样本相同的类型，静音判断保持单精度比较，不逐点提升为double
+    thr = y.dtype.type(silent_thr)
+    with _launch_lock:
+        peak, silent_cnt, pos_sum, pos_cnt, neg_sum, neg_cnt, m2, m3, m4 = _signal_moments(y, thr)
+    pos_mean = pos_sum / pos_cnt if pos_cnt else float('nan')
+    neg_mean = neg_sum / neg_cnt if neg_cnt else float('nan')
+    return {
+        "peak": peak,
+        "silent_ratio": silent_cnt / y.size,
+        "symmetry": pos_mean - neg_mean,
+        "skew": m3 / m2 ** 1.5 if m2 > 0 else float('nan'),
+        "kurtosis": m4 / m2 ** 2 - 3.0 if m2 > 0 else float('nan')
+    }
+
+
+def warmup():
+    """用小数组触发编译（或加载磁盘缓存），避免首次分析时等待JIT"""
+    y = np.zeros(4096, dtype=np.float32)
+    signal_stats(y)
+    frame_rms(y, 2048, 512)